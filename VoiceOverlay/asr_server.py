@@ -6,22 +6,55 @@ MLX ASR 服务端 - 为 Swift VoiceOverlay 提供转录服务
 """
 
 import os
+import re
+import glob
+import mmap
+import atexit
 import sys
 import socket
 import json
 import tempfile
-import wave
 import struct
+import threading
+import traceback
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# 线程数相关环境变量必须在 numpy（Accelerate）/MLX 加载前设置才生效；
+# 推理在 GPU 上完成，CPU 侧只有少量数组转换，限制线程数避免和推理抢核。
+# 用 setdefault，外部显式设置的值优先
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("VECLIB_MAXIMUM_THREADS", "4")
+
+import numpy as np
+
+try:
+    import ahocorasick  # 可选依赖：多模式串匹配（pyahocorasick）
+except ImportError:
+    ahocorasick = None
+
+# 每次请求的详细日志（热词、后处理前后对比等），设置环境变量 ASR_DEBUG=1 开启
+_DEBUG = bool(os.environ.get("ASR_DEBUG"))
+
+# 脚本所在目录（解析符号链接：应用包 Resources 里的 asr_server.py 是指向这里的链接，
+# 配置和热词仍按仓库中的位置查找）
+_SCRIPT_DIR = Path(__file__).resolve().parent
+
 # 默认配置
 CONFIG = {
     "model": "0.6B",  # 默认使用小模型
     "language": "zh",
+    # 短录音专用模型（可选）：时长低于阈值的录音改用这个模型，例如 "0.6B-4bit"
+    "short_model": None,
+    "short_model_max_seconds": 4.0,
     "socket_path": "/tmp/voice_asr_socket",
     "models": {
         "0.6B": "mlx-community/Qwen3-ASR-0.6B-8bit",
-        "1.7B": "mlx-community/Qwen3-ASR-1.7B-8bit"
+        "1.7B": "mlx-community/Qwen3-ASR-1.7B-8bit",
+        # 4bit 量化版本：权重读取量减半，解码更快，精度略有下降
+        "0.6B-4bit": "mlx-community/Qwen3-ASR-0.6B-4bit",
+        "1.7B-4bit": "mlx-community/Qwen3-ASR-1.7B-4bit",
     },
     # LLM 重写模型（本地 MLX）
     "llm_model": "/Users/oliveagle/.cache/modelscope/hub/models/Qwen/Qwen3-0___6B-MLX-4bit",
@@ -37,14 +70,50 @@ CONFIG = {
 }
 
 
-def load_config():
-    """从 YAML 文件加载配置"""
+def _read_config_file(config_file: Path):
+    """读取配置文件内容（优先使用 JSON 缓存，按路径 + 修改时间 + 大小 + inode 判断是否失效）
+
+    解析结果缓存在配置文件旁的 .config.yaml.cache.json：config.yaml 未变化时
+    直接读 JSON，省去导入 PyYAML 和解析 YAML。缓存与配置文件同目录，
+    不放在共享的临时目录，避免被其他用户预先写入伪造的配置。
+    """
+    cache_path = config_file.with_name(f".{config_file.name}.cache.json")
+    st = os.stat(config_file)
+    sig = [str(config_file), st.st_mtime_ns, st.st_size, st.st_ino]
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('sig') == sig:
+            return cached['config']
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
     import yaml
+    with open(config_file, 'r', encoding='utf-8') as f:
+        yaml_config = yaml.safe_load(f)
+
+    # 写入缓存（先写临时文件再替换，避免并发启动读到半个文件）；失败不影响使用
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'sig': sig, 'config': yaml_config}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    return yaml_config
+
 
+def load_config():
+    """从 YAML 文件加载配置"""
     # 查找配置文件
     config_paths = [
-        Path(__file__).parent.parent / "config.yaml",
-        Path(__file__).parent / "config.yaml",
+        _SCRIPT_DIR.parent / "config.yaml",
+        _SCRIPT_DIR / "config.yaml",
     ]
 
     config_file = None
@@ -58,17 +127,19 @@ def load_config():
         return
 
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            yaml_config = yaml.safe_load(f)
+        yaml_config = _read_config_file(config_file)
 
         # 合并配置
         if yaml_config:
             if 'asr' in yaml_config:
-                for key in ['model', 'language']:
+                for key in ['model', 'language', 'short_model', 'short_model_max_seconds']:
                     if key in yaml_config['asr']:
                         CONFIG[key] = yaml_config['asr'][key]
                 if 'models' in yaml_config['asr']:
-                    CONFIG['models'] = yaml_config['asr']['models']
+                    CONFIG['models'].update(yaml_config['asr']['models'])
+            # 兼容旧配置
+            elif isinstance(yaml_config.get('model'), dict):
+                CONFIG['language'] = yaml_config['model'].get('language', CONFIG['language'])
 
             if 'text_processing' in yaml_config:
                 CONFIG['text_processing'].update(yaml_config['text_processing'])
@@ -81,80 +152,111 @@ def load_config():
 # 启动时加载配置
 load_config()
 
-# 当前加载的模型缓存
-_current_model = None
-_current_model_key = None
+# 已加载的模型缓存 {model_key: model}，切换模型时不会丢掉已加载的另一个
+_models = {}
+# MLX 显存缓冲池上限：超出部分释放回系统，长时间听写时内存不会一直停在峰值
+_MLX_CACHE_LIMIT = 512 * 1024 * 1024
+_model_lock = threading.Lock()       # 保护模型加载/切换（预热线程与请求线程共享）
+_inference_lock = threading.Lock()   # 同一时刻只允许一个推理占用模型（需同时持有时先取 _model_lock）
+_warmup_done = threading.Event()     # 预热结束（无论成功与否）后置位，请求在此之前等待
+_WARMUP_WAIT_TIMEOUT = 30.0          # 请求等待预热的最长秒数（首次运行预热包含模型下载，可能很久）
+
+# generate_transcription 要求提供输出文件，但结果直接取返回值，不读文件；
+# 推理已由 _inference_lock 串行化，所有调用共用同一个路径，退出时统一清理
+_OUTPUT_PATH = os.path.join(tempfile.gettempdir(), f"voice_asr_out_{os.getpid()}.txt")
+
+
+@atexit.register
+def _cleanup_output_files():
+    # 同时清理 mlx-audio 可能追加了扩展名的文件
+    for path in glob.glob(glob.escape(_OUTPUT_PATH) + '*'):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
 
 # 热词缓存
 _hotwords = None
-_hotwords_mtime = 0
-
-def load_hotwords():
-    """加载热词词库，支持热更新"""
-    global _hotwords, _hotwords_mtime
+_hotwords_file = None      # 已定位的热词文件（只在首次或文件消失后重新查找）
+_hotwords_sig = None       # 文件签名 (st_mtime_ns, st_size, st_ino)
+_hotwords_context = None   # 预先拼接好的热词提示
+_hotwords_lock = threading.Lock()  # 并发请求同时检查/重载时保护上面几个缓存
 
+def _find_hotwords_file():
+    """按优先级查找热词文件"""
     # 支持多个热词文件位置
     hotwords_paths = [
-        Path(__file__).parent.parent / "hotwords.txt",  # 项目根目录
-        Path(__file__).parent / "hotwords.txt",         # VoiceOverlay 目录
+        _SCRIPT_DIR.parent / "hotwords.txt",  # 项目根目录
+        _SCRIPT_DIR / "hotwords.txt",         # VoiceOverlay 目录
         Path.home() / ".config/ole_voice/hotwords.txt", # 用户配置目录
     ]
 
-    hotwords_file = None
     for path in hotwords_paths:
         if path.exists():
-            hotwords_file = path
-            break
+            return path
+    return None
 
-    if hotwords_file is None:
-        return None
+def load_hotwords():
+    """加载热词词库，支持热更新"""
+    global _hotwords, _hotwords_file, _hotwords_sig, _hotwords_context
 
-    # 检查文件修改时间，避免重复加载
-    try:
-        mtime = hotwords_file.stat().st_mtime
-        if mtime == _hotwords_mtime and _hotwords is not None:
-            return _hotwords
+    with _hotwords_lock:
+        if _hotwords_file is None:
+            _hotwords_file = _find_hotwords_file()
+            if _hotwords_file is None:
+                return None
 
-        with open(hotwords_file, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        # 检查文件签名（修改时间 + 大小 + inode），未变化时直接返回缓存
+        try:
+            st = os.stat(_hotwords_file)
+        except FileNotFoundError:
+            # 文件被移走，下次重新查找
+            _hotwords_file = None
+            _hotwords = _hotwords_sig = _hotwords_context = None
+            return None
 
-        _hotwords = lines
-        _hotwords_mtime = mtime
+        # 编辑器整体替换文件时 inode 会变，即使修改时间和大小碰巧相同也能发现
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if sig == _hotwords_sig:
+            return _hotwords
 
-        if lines:
-            print(f"[Hotwords] 加载 {len(lines)} 个热词 from {hotwords_file}")
+        try:
+            # 一次读入后按字节切行（与文本模式逐行读取的换行规则一致），
+            # 只对保留的行解码，词库很大时比逐行文本读取快
+            with open(_hotwords_file, 'rb') as f:
+                raw = f.read()
+            stripped = (line.decode('utf-8').strip()
+                        for line in raw.splitlines() if not line.startswith(b'#'))
+            lines = [word for word in stripped if word]
+
+            _hotwords = lines
+            _hotwords_sig = sig
+            # 将热词格式化为上下文提示（限制热词数量避免过长）
+            _hotwords_context = "重要术语: " + ", ".join(lines[:20]) if lines else None
+
+            if lines:
+                print(f"[Hotwords] 加载 {len(lines)} 个热词 from {_hotwords_file}")
 
-        return _hotwords
-    except Exception as e:
-        print(f"[Hotwords] 加载失败: {e}")
-        return None
+            return _hotwords
+        except Exception as e:
+            print(f"[Hotwords] 加载失败: {e}")
+            return None
 
-def load_config():
-    """加载用户配置"""
-    global CONFIG
-    try:
-        config_path = Path(__file__).parent.parent / "config.yaml"
-        import yaml
-        with open(config_path, 'r', encoding='utf-8') as f:
-            user_config = yaml.safe_load(f)
-            if user_config:
-                # 读取新的 asr 配置
-                if 'asr' in user_config:
-                    asr_config = user_config['asr']
-                    CONFIG['model'] = asr_config.get('model', '0.6B')
-                    CONFIG['language'] = asr_config.get('language', 'zh')
-                    if 'models' in asr_config:
-                        CONFIG['models'].update(asr_config['models'])
-                # 兼容旧配置
-                elif 'model' in user_config:
-                    CONFIG['language'] = user_config['model'].get('language', 'zh')
-    except Exception as e:
-        print(f"[Config] 加载配置失败，使用默认配置: {e}")
+# 已解析的模型路径（按模型名缓存，进程运行期间模型目录不会移动）
+_model_paths = {}
 
 def get_model_path(model_key: str) -> str:
     """获取模型路径，优先使用本地缓存"""
     model_name = CONFIG['models'].get(model_key, CONFIG['models']['0.6B'])
 
+    if model_name in _model_paths:
+        return _model_paths[model_name]
+    _model_paths[model_name] = path = _resolve_model_path(model_name)
+    return path
+
+def _resolve_model_path(model_name: str) -> str:
+    """查找模型的本地缓存目录，找不到时返回远程模型名"""
     # 检查本地缓存
     cache_dirs = [
         Path.home() / f".cache/modelscope/hub/models/{model_name}",
@@ -166,26 +268,123 @@ def get_model_path(model_key: str) -> str:
             print(f"[ASR] 使用本地模型: {cache_dir}")
             return str(cache_dir)
 
+    # 检查 HuggingFace 缓存（首次按远程模型名加载时下载到这里）；
+    # 直接使用本地快照目录，省去每次启动向 Hub 校验版本的网络请求
+    snapshot = _find_hf_snapshot(model_name)
+    if snapshot is not None:
+        print(f"[ASR] 使用本地模型: {snapshot}")
+        return str(snapshot)
+
     print(f"[ASR] 使用远程模型: {model_name}")
     return model_name
 
+def _find_hf_snapshot(model_name: str):
+    """查找 HuggingFace 缓存中模型当前版本（refs/main）的快照目录"""
+    hub_cache = os.environ.get("HF_HUB_CACHE")
+    if hub_cache:
+        hub_dir = Path(hub_cache)
+    else:
+        hub_dir = Path(os.environ.get("HF_HOME", Path.home() / ".cache/huggingface")) / "hub"
+
+    repo_dir = hub_dir / f"models--{model_name.replace('/', '--')}"
+    try:
+        revision = (repo_dir / "refs" / "main").read_text().strip()
+    except OSError:
+        return None
+
+    snapshot = repo_dir / "snapshots" / revision
+    return snapshot if _snapshot_complete(snapshot) else None
+
+def _snapshot_complete(snapshot: Path) -> bool:
+    """快照目录中权重是否已完整下载
+
+    huggingface_hub 先写 refs/main，再逐个文件链接进快照目录，
+    下载中断会留下不完整的目录；这种情况返回 False，改用远程模型名续传。
+    """
+    if not (snapshot / "config.json").is_file():
+        return False
+
+    index_file = snapshot / "model.safetensors.index.json"
+    if index_file.exists():
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                shards = set(json.load(f).get("weight_map", {}).values())
+        except (OSError, ValueError, AttributeError):
+            return False
+        return bool(shards) and all((snapshot / name).is_file() for name in shards)
+
+    return any(path.is_file() for path in snapshot.glob('*.safetensors'))
+
+# mmap.madvise 需要 Python 3.8+ 且平台支持 MADV_WILLNEED
+_MADV_WILLNEED = getattr(mmap, 'MADV_WILLNEED', None) if hasattr(mmap.mmap, 'madvise') else None
+
+# 已发起预读的模型目录（预热时提前发起，load_model 中不再重复）
+_prefetched_paths = set()
+
+def _prefetch_model_files(model_path: str):
+    """后台把本地权重文件提前读进系统页缓存
+
+    预热线程在导入 mlx_audio（需要数秒）之前为所有配置的模型发起预读，
+    两者重叠进行，之后加载权重时直接命中页缓存。
+    优先用 mmap + MADV_WILLNEED 交给内核预读，不经过用户态拷贝；
+    不支持时退回顺序 readinto。远程模型（尚未下载）不做处理。
+    """
+    if model_path in _prefetched_paths:
+        return
+    _prefetched_paths.add(model_path)
+
+    files = sorted(Path(model_path).glob('*.safetensors'))
+    if not files:
+        return
+
+    def _read_all():
+        buf = None
+        for path in files:
+            try:
+                with open(path, 'rb', buffering=0) as f:
+                    if _MADV_WILLNEED is not None:
+                        try:
+                            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                                m.madvise(_MADV_WILLNEED)
+                            continue
+                        except (OSError, ValueError):
+                            pass
+                    if buf is None:
+                        buf = bytearray(8 << 20)
+                    while f.readinto(buf):
+                        pass
+            except OSError:
+                pass
+
+    threading.Thread(target=_read_all, daemon=True).start()
+
 def load_model(model_key: str):
     """加载指定模型（带缓存）"""
-    global _current_model, _current_model_key
+    with _model_lock:
+        # 如果模型已经加载，直接返回
+        model = _models.get(model_key)
+        if model is not None:
+            return model
+
+        model_path = get_model_path(model_key)
+        _prefetch_model_files(model_path)
 
-    # 如果模型已经加载，直接返回
-    if _current_model is not None and _current_model_key == model_key:
-        return _current_model
+        from mlx_audio.stt.utils import load_model as mlx_load_model
+        import mlx.core as mx
 
-    from mlx_audio.stt.utils import load_model as mlx_load_model
+        mx.set_cache_limit(_MLX_CACHE_LIMIT)
 
-    model_path = get_model_path(model_key)
-    print(f"[ASR] 加载模型 [{model_key}]...")
-    _current_model = mlx_load_model(model_path)
-    _current_model_key = model_key
-    print(f"[ASR] 模型 [{model_key}] 加载完成")
+        print(f"[ASR] 加载模型 [{model_key}]...")
+        # 加载与物化参数都会执行 MLX 计算，与其他推理串行（锁顺序：_model_lock -> _inference_lock）
+        with _inference_lock:
+            model = mlx_load_model(model_path)
+            # MLX 参数是惰性加载的，这里强制物化，避免把读盘开销留到第一次推理
+            if hasattr(model, "parameters"):
+                mx.eval(model.parameters())
+        _models[model_key] = model
+        print(f"[ASR] 模型 [{model_key}] 加载完成")
 
-    return _current_model
+        return model
 
 # 音近词纠正映射表
 PHONETIC_CORRECTIONS = {
@@ -209,7 +408,6 @@ PHONETIC_CORRECTIONS = {
     # 编程术语
     "派森": "Python",
     "拍森": "Python",
-    "拍森": "Python",
     "趴森": "Python",
     "泰普 script": "TypeScript",
     "泰普斯克瑞普特": "TypeScript",
@@ -221,7 +419,6 @@ PHONETIC_CORRECTIONS = {
     "瑞艾克": "React",
     "维艾尤": "Vue",
     "维尤": "Vue",
-    "维尤": "Vue",
     "安古勒": "Angular",
     "安哥拉": "Angular",
     "节普斯": "GitHub",
@@ -278,24 +475,57 @@ PHONETIC_CORRECTIONS = {
     "西艾西迪": "CI/CD",
 }
 
-def apply_phonetic_corrections(text: str) -> str:
-    """应用音近词纠正"""
-    if not text:
+# 预编译音近词纠正正则：所有词合并为一个交替模式，按长度降序保证最长匹配优先
+_PHONETIC_RE = re.compile('|'.join(
+    re.escape(wrong) for wrong in sorted(PHONETIC_CORRECTIONS, key=len, reverse=True)
+))
+# 所有纠正词的首字符：文本中一个都没有时可以跳过整个扫描
+_PHONETIC_FIRST_CHARS = frozenset(wrong[0] for wrong in PHONETIC_CORRECTIONS)
+
+
+def _build_phonetic_automaton():
+    """构建音近词 Aho-Corasick 自动机（未安装 pyahocorasick 时返回 None）"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for wrong, right in PHONETIC_CORRECTIONS.items():
+        automaton.add_word(wrong, (len(wrong), right))
+    automaton.make_automaton()
+    return automaton
+
+
+_PHONETIC_AC = _build_phonetic_automaton()
+
+
+def _replace_phonetic_ac(text: str) -> str:
+    """单次线性扫描完成音近词替换（与 _PHONETIC_RE 语义一致：最左最长优先）"""
+    hits = [(end - length + 1, -length, right)
+            for end, (length, right) in _PHONETIC_AC.iter(text)]
+    if not hits:
         return text
 
-    corrected = text
-    for wrong, correct in PHONETIC_CORRECTIONS.items():
-        # 使用词边界匹配，避免误替换
-        import re
-        # 构建正则：匹配整个词，支持中文词边界
-        pattern = re.escape(wrong)
-        corrected = re.sub(pattern, correct, corrected)
+    # 最左最长优先，跳过重叠命中
+    hits.sort()
+    parts = []
+    pos = 0
+    for start, neg_length, right in hits:
+        if start < pos:
+            continue
+        parts.append(text[pos:start])
+        parts.append(right)
+        pos = start - neg_length
+    parts.append(text[pos:])
+    return ''.join(parts)
 
-    # 如果发生了纠正，记录日志
-    if corrected != text:
-        print(f"[Phonetic] '{text}' -> '{corrected}'")
+def apply_phonetic_corrections(text: str) -> str:
+    """应用音近词纠正"""
+    if not text or _PHONETIC_FIRST_CHARS.isdisjoint(text):
+        return text
 
-    return corrected
+    # 单次扫描完成所有替换
+    if _PHONETIC_AC is not None:
+        return _replace_phonetic_ac(text)
+    return _PHONETIC_RE.sub(lambda m: PHONETIC_CORRECTIONS[m.group(0)], text)
 
 
 # 语气词/填充词列表
@@ -317,200 +547,228 @@ FILLER_WORDS = [
     "literally", "so yeah", "you see",
 ]
 
+# 标点符号边界
+_FILLER_PUNCTS = '，。！？、；：""''（）【】,.!?;:\'"()[]'
+_FILLER_STRIP_CHARS = ' ' + _FILLER_PUNCTS
+
+# 预编译语气词正则：所有语气词合并为一个交替模式（按长度降序），
+# 用零宽断言匹配前后有边界（标点/空格/字符串边界）的独立语气词。
+# 边界字符不被消耗，相邻语气词可在同一次扫描中全部移除，无需多轮迭代。
+_FILLER_RE = re.compile(
+    rf'(?<![^\s{re.escape(_FILLER_PUNCTS)}])'
+    rf'(?:{"|".join(re.escape(w) for w in sorted(set(FILLER_WORDS), key=len, reverse=True))})'
+    rf'(?![^\s{re.escape(_FILLER_PUNCTS)}])'
+)
+
+_FILLER_BOUNDARY = frozenset(_FILLER_PUNCTS)
+_FILLER_FIRST_CHARS = frozenset(word[0] for word in FILLER_WORDS if word)
+
+
+def _build_filler_automaton():
+    """构建语气词 Aho-Corasick 自动机（未安装 pyahocorasick 时返回 None）"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in set(FILLER_WORDS):
+        automaton.add_word(word, len(word))
+    automaton.make_automaton()
+    return automaton
+
+
+_FILLER_AC = _build_filler_automaton()
+
+_WS_RE = re.compile(r'\s+')
+
+
+def _is_filler_boundary(ch: str) -> bool:
+    return ch.isspace() or ch in _FILLER_BOUNDARY
+
+
+def _strip_fillers_ac(text: str) -> str:
+    """单次线性扫描移除独立语气词（与 _FILLER_RE 语义一致）"""
+    n = len(text)
+    hits = []
+    for end, length in _FILLER_AC.iter(text):
+        start = end - length + 1
+        if (start == 0 or _is_filler_boundary(text[start - 1])) and \
+                (end + 1 == n or _is_filler_boundary(text[end + 1])):
+            hits.append((start, -length))
+
+    if not hits:
+        return text
+
+    # 最左最长优先，跳过重叠命中
+    hits.sort()
+    parts = []
+    pos = 0
+    for start, neg_length in hits:
+        if start < pos:
+            continue
+        parts.append(text[pos:start])
+        pos = start - neg_length
+    parts.append(text[pos:])
+    return ''.join(parts)
+
 def remove_filler_words(text: str) -> str:
     """移除语气词/填充词"""
     if not text:
         return text
 
-    original = text
-    import re
-
-    # 定义标点符号边界
-    puncts = '，。！？、；：""''（）【】,.!?;:\'"()[]'
-
-    # 按长度降序排列语气词
-    words = sorted(set(FILLER_WORDS), key=len, reverse=True)
-
-    # 多次迭代直到没有变化
-    for _ in range(3):
-        changed = False
-        for word in words:
-            # 匹配独立语气词：前后有边界（标点/空格/字符串边界）
-            pattern = rf'(^|\s|[{re.escape(puncts)}]){re.escape(word)}($|\s|[{re.escape(puncts)}])'
-            new_text = re.sub(pattern, r'\1\2', text)
-            if new_text != text:
-                changed = True
-                text = new_text
-
-        if not changed:
-            break
+    # 不含任何语气词首字符时跳过匹配，只做空白和首尾清理
+    if not _FILLER_FIRST_CHARS.isdisjoint(text):
+        if _FILLER_AC is not None:
+            text = _strip_fillers_ac(text)
+        else:
+            text = _FILLER_RE.sub('', text)
 
     # 清理多余空白
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
 
     # 清理开头结尾的标点和空格
-    text = text.strip(f' {puncts}')
-
-    if text != original:
-        print(f"[Filler] '{original}' -> '{text}'")
+    text = text.strip(_FILLER_STRIP_CHARS)
 
     return text
 
 
-def convert_chinese_numbers(text: str) -> str:
-    """将文本中的中文数字转换为阿拉伯数字"""
-    if not text:
-        return text
+# 匹配中文数字序列（包括第X个这种情况）
+_CN_NUM_RE = re.compile(r'第?[零〇一二三四五六七八九十百千万亿]+')
+_CN_NUM_CHARS = frozenset('零〇一二三四五六七八九十百千万亿')
 
-    original = text
+_CN_DIGITS = {'零': 0, '〇': 0, '一': 1, '二': 2, '三': 3, '四': 4,
+              '五': 5, '六': 6, '七': 7, '八': 8, '九': 9}
+_CN_UNITS = {'十': 10, '百': 100, '千': 1000, '万': 10000, '亿': 100000000}
+# 数字和单位合并为一张表：值 < 10 为数字，>= 10 为单位，循环内每个字符只查一次表
+_CN_VALUES = {**_CN_DIGITS, **_CN_UNITS}
 
-    def parse_number(match):
-        """解析单个中文数字"""
-        cn = match.group()
-        if not cn:
-            return cn
-
-        # 移除"第"前缀
-        is_ordinal = cn.startswith('第')
-        if is_ordinal:
-            cn = cn[1:]
-
-        # 解析数字
-        result = _parse_cn(cn)
-        if result is not None:
-            return ('第' if is_ordinal else '') + str(result)
-        return match.group()
-
-    def _parse_cn(cn):
-        """解析中文数字为整数（支持更复杂的数字）"""
-        if not cn:
-            return None
+# 不含单位的纯数字序列逐位映射（如"一二三"->"123"），由 str.translate 在 C 层完成
+_CN_DIGIT_TABLE = str.maketrans('零〇一二三四五六七八九', '00123456789')
 
-        digit_map = {'零': 0, '〇': 0, '一': 1, '二': 2, '三': 3, '四': 4,
-                    '五': 5, '六': 6, '七': 7, '八': 8, '九': 9}
-        unit_map = {'十': 10, '百': 100, '千': 1000, '万': 10000, '亿': 100000000}
-
-        # 简单个位数
-        if len(cn) == 1 and cn in digit_map:
-            return digit_map.get(cn)
-
-        # 处理"十"开头的特殊情况（如"十二"=12，"十万"=100000）
-        if cn.startswith('十'):
-            cn = '一' + cn
-
-        total = 0
-        temp = 0
-        last_unit = 1
-
-        i = 0
-        while i < len(cn):
-            char = cn[i]
-
-            if char in digit_map:
-                temp = digit_map[char]
-            elif char in unit_map:
-                unit = unit_map[char]
-                if unit > last_unit:
-                    # 遇到更大的单位（万、亿），将之前的结果乘以这个单位
-                    total = (total + temp) * unit
-                else:
-                    # 普通单位（十、百、千）
-                    total += temp * unit
-                temp = 0
-                last_unit = unit
-            i += 1
 
-        total += temp
+def _parse_cn(cn):
+    """解析中文数字为整数（支持更复杂的数字）"""
+    if not cn:
+        return None
 
-        if total > 0:
-            return total
+    # 简单个位数
+    if len(cn) == 1 and cn in _CN_DIGITS:
+        return _CN_DIGITS[cn]
 
-        return None  # 无法解析
+    total = 0
+    # 处理"十"开头的特殊情况（如"十二"=12，"十万"=100000），相当于前面补一个"一"
+    temp = 1 if cn[0] == '十' else 0
+    last_unit = 1
 
-    # 匹配中文数字序列（包括第X个这种情况）
-    import re
-    pattern = r'第?[零〇一二三四五六七八九十百千万亿]+'
-    text = re.sub(pattern, parse_number, text)
+    for value in map(_CN_VALUES.__getitem__, cn):
+        if value < 10:
+            temp = value
+        elif value > last_unit:
+            # 遇到更大的单位（万、亿），将之前的结果乘以这个单位
+            total = (total + temp) * value
+            temp = 0
+            last_unit = value
+        else:
+            # 普通单位（十、百、千）
+            total += temp * value
+            temp = 0
+            last_unit = value
 
-    if text != original:
-        print(f"[Number] '{original}' -> '{text}'")
+    total += temp
 
-    return text
+    if total > 0:
+        return total
 
+    return None  # 无法解析
 
-def clean_punctuation(text: str) -> str:
-    """清理重复标点和多余符号"""
-    if not text:
-        return text
 
-    original = text
-    import re
+@lru_cache(maxsize=1024)
+def _convert_cn_token(token: str) -> str:
+    """转换单个中文数字片段（"第一"、"一百"这类短片段反复出现，结果做缓存）"""
+    cn = token
 
-    # 1. 统一标点（中文标点优先）
-    text = text.replace('，,', '，').replace(',，', '，')
-    text = text.replace('。.', '。').replace('.。', '。')
+    # 移除"第"前缀
+    is_ordinal = cn.startswith('第')
+    if is_ordinal:
+        cn = cn[1:]
 
-    # 2. 清理重复逗号（核心问题）
-    text = re.sub(r'，\s*，+', '，', text)
-    text = re.sub(r',\s*,+', ',', text)
-    text = re.sub(r'，\s*,', '，', text)
-    text = re.sub(r',\s*，', '，', text)
+    # 纯数字序列（不含十百千万亿）直接逐位转换
+    if cn and _CN_UNITS.keys().isdisjoint(cn):
+        return ('第' if is_ordinal else '') + cn.translate(_CN_DIGIT_TABLE)
 
-    # 3. 清理重复句号
-    text = re.sub(r'。\s*。+', '。', text)
-    text = re.sub(r'\.\s*\.+', '.', text)
+    # 含单位时走结构化解析
+    result = _parse_cn(cn)
+    if result is not None:
+        return ('第' if is_ordinal else '') + str(result)
+    return token
 
-    # 4. 清理重复问号、感叹号
-    text = re.sub(r'？\s*？+', '？', text)
-    text = re.sub(r'!\s*!+', '!', text)
-    text = re.sub(r'！\s*！+', '！', text)
 
-    # 5. 清理句首的标点
-    text = re.sub(r'^[，。！？、；：,.!?;:\s]+', '', text)
+def _parse_number(match):
+    """解析单个中文数字"""
+    return _convert_cn_token(match.group())
 
-    # 6. 清理句尾多余的逗号
-    text = re.sub(r'[，,\s]+$', '', text)
 
-    # 7. 清理多余空格
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
+def convert_chinese_numbers(text: str) -> str:
+    """将文本中的中文数字转换为阿拉伯数字"""
+    if not text or _CN_NUM_CHARS.isdisjoint(text):
+        return text
 
-    if text != original:
-        print(f"[Punct] '{original}' -> '{text}'")
+    return _CN_NUM_RE.sub(_parse_number, text)
 
-    return text
 
+# 连续重复标点（中间可夹空白）：逗号、句号、问号、感叹号
+_PUNCT_RUN_RE = re.compile(r'[，,](?:\s*[，,])+|[。.](?:\s*[。.])+|？(?:\s*？)+|!(?:\s*!)+|！(?:\s*！)+')
 
-def polish_sentence(text: str) -> str:
-    """轻量级句子润色"""
+# 句首需要清理的标点；句尾只清理逗号（空白由 _WS_RE 统一为空格后一并去掉）
+_PUNCT_LEADING_CHARS = '，。！？、；：,.!?;: '
+_PUNCT_TRAILING_CHARS = '，, '
+
+
+def _collapse_punct_run(match):
+    """将一串重复标点合并为一个（中英混用时中文标点优先）"""
+    run = match.group()
+    first = run[0]
+    if first in '，,':
+        return '，' if '，' in run else ','
+    if first in '。.':
+        return '。' if '。' in run else '.'
+    return first
+
+
+def clean_punctuation(text: str) -> str:
+    """清理重复标点和多余符号"""
     if not text:
         return text
 
-    original = text
-    import re
+    # 1. 合并重复标点（单次扫描）
+    text = _PUNCT_RUN_RE.sub(_collapse_punct_run, text)
+
+    # 2. 清理多余空格
+    text = _WS_RE.sub(' ', text)
+
+    # 3. 清理句首的标点和句尾多余的逗号
+    text = text.lstrip(_PUNCT_LEADING_CHARS).rstrip(_PUNCT_TRAILING_CHARS)
+
+    return text
+
 
-    # 1. 修正"1些"->"一些"这类常见误转换
+# 句子润色规则（按顺序执行）
+_POLISH_RULES = [
+    # 修正"1些"->"一些"这类常见误转换
     # 只有当"1"后面跟的是"些"或"下"时才还原（这些是固定词）
-    text = re.sub(r'1些', '一些', text)
-    text = re.sub(r'1下', '一下', text)
-
-    # 2. 常见口语表达修正
-    corrections = [
-        (r'那个那个', '那个'),
-        (r'这个这个', '这个'),
-        (r'然后然后', '然后'),
-        (r'就是就是', '就是'),
-        (r'好吧好吧', '好吧'),
-    ]
+    (re.compile(r'1([些下])'), r'一\1'),
+    # 常见口语表达修正（重复词合并）
+    (re.compile(r'(那个|这个|然后|就是|好吧)\1'), r'\1'),
+    # 数字后面的单位整理（如"1个"保持不变，"1 个"合并）
+    (re.compile(r'(\d)\s+(个|只|条|张|本|页|行|列|米|厘米|公里|千克|克)'), r'\1\2'),
+]
 
-    for pattern, repl in corrections:
-        text = re.sub(pattern, repl, text)
 
-    # 3. 数字后面的单位整理（如"1个"保持不变，"1 个"合并）
-    text = re.sub(r'(\d)\s+(个|只|条|张|本|页|行|列|米|厘米|公里|千克|克)', r'\1\2', text)
+def polish_sentence(text: str) -> str:
+    """轻量级句子润色"""
+    if not text:
+        return text
 
-    if text != original:
-        print(f"[Polish] '{original}' -> '{text}'")
+    for pattern, repl in _POLISH_RULES:
+        text = pattern.sub(repl, text)
 
     return text
 
@@ -538,15 +796,17 @@ def llm_rewrite(text: str) -> str:
         return text
 
     # 首次加载模型
-    if _llm_model_cache is None:
-        try:
-            from mlx_lm import load as load_mlx_model
-            print(f"[LLM] 加载本地模型: {model_path}")
-            _llm_model_cache, _llm_tokenizer_cache = load_mlx_model(model_path)
-            print("[LLM] 模型加载完成")
-        except Exception as e:
-            print(f"[LLM] 模型加载失败: {e}")
-            return text
+    with _model_lock:
+        if _llm_model_cache is None:
+            try:
+                from mlx_lm import load as load_mlx_model
+                print(f"[LLM] 加载本地模型: {model_path}")
+                with _inference_lock:
+                    _llm_model_cache, _llm_tokenizer_cache = load_mlx_model(model_path)
+                print("[LLM] 模型加载完成")
+            except Exception as e:
+                print(f"[LLM] 模型加载失败: {e}")
+                return text
 
     # 构建提示词 (Qwen3 聊天模板)
     system_prompt = "你是一个专业的文本润色助手。请将用户输入的文本润色得更通顺自然，保持原意，修正明显的识别错误。如果原文已经通顺，直接返回原文。不要添加任何解释或前缀。"
@@ -560,13 +820,14 @@ def llm_rewrite(text: str) -> str:
         sampler = make_sampler(tempature=0.3)
 
         # 生成回复
-        response = generate(
-            _llm_model_cache,
-            _llm_tokenizer_cache,
-            prompt=f"<|im_start|>system\n{system_prompt}<|im_end|>\n<|im_start|>user\n{user_prompt}<|im_end|>\n<|im_start|>assistant\n",
-            sampler=sampler,
-            max_tokens=500
-        )
+        with _inference_lock:
+            response = generate(
+                _llm_model_cache,
+                _llm_tokenizer_cache,
+                prompt=f"<|im_start|>system\n{system_prompt}<|im_end|>\n<|im_start|>user\n{user_prompt}<|im_end|>\n<|im_start|>assistant\n",
+                sampler=sampler,
+                max_tokens=500
+            )
 
         # 提取 assistant 的回复（去掉 prompt 部分）
         rewritten = response.strip()
@@ -575,48 +836,151 @@ def llm_rewrite(text: str) -> str:
         if '<|im_end|>' in rewritten:
             rewritten = rewritten.split('<|im_end|>')[0].strip()
 
-        if rewritten and rewritten != text:
-            print(f"[LLM] '{text}' -> '{rewritten}'")
-
         return rewritten if rewritten else text
 
     except Exception as e:
         print(f"[LLM] 重写失败: {e}")
-        import traceback
         traceback.print_exc()
         return text
 
 
-def transcribe_audio(audio_path: str) -> dict:
-    """使用 MLX Audio 转录音频"""
+# 文本后处理流水线：(配置开关, 默认值, 日志标签, 处理函数)，按顺序执行
+# 各步骤有先后依赖（如音近词纠正后才做语气词过滤），不能合并成一次替换
+_POSTPROCESSORS = [
+    ('enable_phonetic_correction', False, 'Phonetic', apply_phonetic_corrections),
+    ('enable_filler_word_removal', False, 'Filler', remove_filler_words),
+    ('enable_number_conversion', False, 'Number', convert_chinese_numbers),
+    ('enable_sentence_polishing', False, 'Polish', polish_sentence),
+    ('enable_punctuation_cleanup', True, 'Punct', clean_punctuation),  # 默认开启
+    ('enable_llm_rewrite', False, 'LLM', llm_rewrite),
+]
+
+
+def postprocess_text(text: str) -> str:
+    """按配置依次执行文本后处理，有改动时只输出一行汇总日志"""
+    tp = CONFIG.get('text_processing', {})
+    original = text
+    applied = []
+
+    for key, default, tag, func in _POSTPROCESSORS:
+        if tp.get(key, default):
+            processed = func(text)
+            if processed != text:
+                applied.append(tag)
+                text = processed
+
+    if _DEBUG and applied:
+        print(f"[PostProcess] {'+'.join(applied)}: '{original}' -> '{text}'")
+
+    return text
+
+
+# 预编译的定长字段格式：协议长度头（大端）和 WAV 块大小（小端）
+_U32_BE = struct.Struct('!I')
+_U32_LE = struct.Struct('<I')
+
+
+def _extract_pcm(payload):
+    """从客户端数据中取出 PCM 采样
+
+    客户端发送的是带 WAV 头的数据（录音文件本身也带 WAV 头，可能嵌套多层），
+    逐层定位 data 块；不是 RIFF 格式时按裸 PCM 处理。返回 memoryview，不复制数据。
+    """
+    view = memoryview(payload)
+    while len(view) >= 12 and view[0:4] == b'RIFF' and view[8:12] == b'WAVE':
+        offset = 12
+        data = None
+        while offset + 8 <= len(view):
+            chunk_id = view[offset:offset + 4]
+            chunk_size = _U32_LE.unpack_from(view, offset + 4)[0]
+            if chunk_id == b'data':
+                data = view[offset + 8:offset + 8 + chunk_size]
+                break
+            offset += 8 + chunk_size + (chunk_size & 1)
+        if data is None:
+            break
+        view = data
+    # int16 需要偶数字节
+    return view[:len(view) & ~1]
+
+
+def pcm_to_float32(pcm) -> np.ndarray:
+    """16bit PCM -> [-1, 1] float32 采样"""
+    return np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+
+
+# 首尾静音裁剪参数（16kHz）
+_TRIM_FRAME = 160          # 10ms 一帧
+_TRIM_THRESHOLD = 0.01     # 帧内峰值低于 -40 dBFS 视为静音
+_TRIM_MARGIN = 4000        # 语音两端各保留 0.25 秒，避免切掉轻声的起止音
+
+
+def trim_silence(samples: np.ndarray) -> np.ndarray:
+    """裁掉录音首尾的静音（按下快捷键到开口、说完到松开之间的空白），减少编码器计算量
+
+    整段都是静音时原样返回。返回的是原数组的切片，不复制数据。
+    """
+    n_frames = len(samples) // _TRIM_FRAME
+    if n_frames == 0:
+        return samples
+
+    peaks = np.abs(samples[:n_frames * _TRIM_FRAME]).reshape(n_frames, _TRIM_FRAME).max(axis=1)
+    voiced = np.flatnonzero(peaks >= _TRIM_THRESHOLD)
+    if voiced.size == 0:
+        return samples
+
+    start = max(int(voiced[0]) * _TRIM_FRAME - _TRIM_MARGIN, 0)
+    end = min((int(voiced[-1]) + 1) * _TRIM_FRAME + _TRIM_MARGIN, len(samples))
+    return samples[start:end]
+
+
+# 配置中的语言代码 -> MLX Audio 的语言名
+_LANG_MAP = {'zh': 'Chinese', 'en': 'English', 'auto': 'Chinese'}
+
+
+def _select_model_key(audio) -> str:
+    """选择本次转录使用的模型：配置了 short_model 且录音足够短时用它，否则用主模型"""
+    short_model = CONFIG.get('short_model')
+    if short_model and short_model in CONFIG['models'] and isinstance(audio, np.ndarray):
+        if len(audio) < CONFIG.get('short_model_max_seconds', 4.0) * 16000:
+            return short_model
+    return CONFIG['model']
+
+
+def transcribe_audio(audio) -> dict:
+    """使用 MLX Audio 转录音频
+
+    audio: 音频文件路径，或 16kHz 单声道 float32 采样数组（直接送入模型，无需写 WAV）
+    """
     try:
         from mlx_audio.stt.generate import generate_transcription
+        import mlx.core as mx
 
-        # 获取当前配置的模型
-        model_key = CONFIG['model']
+        # 获取当前配置的模型（短录音可路由到更小更快的模型）
+        model_key = _select_model_key(audio)
         model = load_model(model_key)
 
-        lang_map = {'zh': 'Chinese', 'en': 'English', 'auto': 'Chinese'}
-        mlx_lang = lang_map.get(CONFIG['language'], 'Chinese')
+        if isinstance(audio, np.ndarray):
+            audio = mx.array(audio)
+
+        mlx_lang = _LANG_MAP.get(CONFIG['language'], 'Chinese')
 
         # 加载热词
         hotwords = load_hotwords()
         context = None
         if hotwords:
-            # 将热词格式化为上下文提示
-            context = "重要术语: " + ", ".join(hotwords[:20])  # 限制热词数量避免过长
-            print(f"[ASR] 使用热词: {len(hotwords)} 个")
-
-        print(f"[ASR] 开始转录 (模型: {model_key}, 语言: {mlx_lang})...")
+            context = _hotwords_context
+            if _DEBUG:
+                print(f"[ASR] 使用热词: {len(hotwords)} 个")
 
-        # 创建临时输出文件路径
-        output_path = tempfile.NamedTemporaryFile(suffix='.txt', delete=False).name
+        if _DEBUG:
+            print(f"[ASR] 开始转录 (模型: {model_key}, 语言: {mlx_lang})...")
 
         # 构建转录参数
         transcription_kwargs = {
             "model": model,
-            "audio": audio_path,
-            "output_path": output_path,
+            "audio": audio,
+            "output_path": _OUTPUT_PATH,
             "language": mlx_lang,
             "verbose": False
         }
@@ -625,49 +989,22 @@ def transcribe_audio(audio_path: str) -> dict:
         if context:
             transcription_kwargs["context"] = context
 
-        result = generate_transcription(**transcription_kwargs)
-
-        # 清理临时输出文件
-        try:
-            os.unlink(output_path)
-        except:
-            pass
+        with _inference_lock:
+            try:
+                result = generate_transcription(**transcription_kwargs)
+            finally:
+                # 释放本次推理留下的缓存缓冲区
+                mx.clear_cache()
 
         text = result.text.strip() if hasattr(result, 'text') else str(result).strip()
 
-        # 获取文本处理配置
-        tp = CONFIG.get('text_processing', {})
-
         # 后处理流水线（根据配置开关）
-        # 1. 音近词纠正
-        if tp.get('enable_phonetic_correction', False):
-            text = apply_phonetic_corrections(text)
-
-        # 2. 语气词过滤
-        if tp.get('enable_filler_word_removal', False):
-            text = remove_filler_words(text)
-
-        # 3. 中文数字转阿拉伯数字
-        if tp.get('enable_number_conversion', False):
-            text = convert_chinese_numbers(text)
-
-        # 4. 句子润色
-        if tp.get('enable_sentence_polishing', False):
-            text = polish_sentence(text)
-
-        # 5. 标点清理（默认开启）
-        if tp.get('enable_punctuation_cleanup', True):
-            text = clean_punctuation(text)
-
-        # 6. LLM 重写（可选）
-        if tp.get('enable_llm_rewrite', False):
-            text = llm_rewrite(text)
+        text = postprocess_text(text)
 
         return {"success": True, "text": text}
 
     except Exception as e:
         print(f"[ASR] 错误: {e}")
-        import traceback
         traceback.print_exc()
         return {"success": False, "error": str(e)}
 
@@ -675,51 +1012,46 @@ def handle_client(conn: socket.socket):
     """处理客户端请求"""
     try:
         # 接收数据长度 (4字节)
-        length_bytes = conn.recv(4)
-        if not length_bytes:
+        length_bytes = conn.recv(_U32_BE.size, socket.MSG_WAITALL)
+        if len(length_bytes) < _U32_BE.size:
             return
 
-        data_length = struct.unpack('!I', length_bytes)[0]
+        data_length = _U32_BE.unpack(length_bytes)[0]
 
-        # 接收音频数据
-        audio_data = b''
-        while len(audio_data) < data_length:
-            chunk = conn.recv(min(4096, data_length - len(audio_data)))
-            if not chunk:
+        # 接收音频数据（预分配缓冲区，recv_into 直接写入，避免反复拼接复制）
+        audio_data = bytearray(data_length)
+        view = memoryview(audio_data)
+        received = 0
+        while received < data_length:
+            n = conn.recv_into(view[received:], min(65536, data_length - received))
+            if not n:
                 break
-            audio_data += chunk
+            received += n
 
-        # 保存为临时 WAV 文件
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-            temp_path = f.name
+        # 直接在内存中转换为采样数组转录，不再写临时 WAV 文件
+        samples = trim_silence(pcm_to_float32(_extract_pcm(view[:received])))
 
-        # 写入 WAV 格式
-        with wave.open(temp_path, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(16000)
-            wf.writeframes(audio_data)
+        # 等预热完成再推理，避免首个请求与预热抢跑、自己承担冷启动
+        ready = _warmup_done.is_set()
+        if not ready:
+            print("[ASR Server] 模型预热中，请求等待...")
+            ready = _warmup_done.wait(timeout=_WARMUP_WAIT_TIMEOUT)
 
-        # 转录
-        result = transcribe_audio(temp_path)
+        if ready:
+            result = transcribe_audio(samples)
+        else:
+            print("[ASR Server] 等待预热超时，返回错误")
+            result = {"success": False, "error": "模型加载中，请稍后再试"}
 
-        # 清理
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
-
-        # 发送结果
+        # 发送结果（长度头和内容一次发出）
         response = json.dumps(result).encode('utf-8')
-        conn.send(struct.pack('!I', len(response)))
-        conn.send(response)
+        conn.sendall(_U32_BE.pack(len(response)) + response)
 
     except Exception as e:
         print(f"[Server] 处理错误: {e}")
         error_response = json.dumps({"success": False, "error": str(e)}).encode('utf-8')
         try:
-            conn.send(struct.pack('!I', len(error_response)))
-            conn.send(error_response)
+            conn.sendall(_U32_BE.pack(len(error_response)) + error_response)
         except:
             pass
     finally:
@@ -729,44 +1061,44 @@ def warmup_model():
     """预热模型，提前加载到内存"""
     try:
         print("[ASR Server] 正在预热模型...")
-        model_key = CONFIG['model']
-        model = load_model(model_key)
-
-        # 创建一段静音音频进行假转录，触发模型编译
-        import numpy as np
-        silence = np.zeros(16000, dtype=np.float32)  # 1秒静音
 
-        # 保存为临时 WAV
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-            temp_path = f.name
+        # 主模型之外，配置了短录音模型时一并预热
+        model_keys = [CONFIG['model']]
+        short_model = CONFIG.get('short_model')
+        if short_model and short_model in CONFIG['models'] and short_model not in model_keys:
+            model_keys.append(short_model)
 
-        with wave.open(temp_path, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(16000)
-            # 将 float32 转换为 int16
-            silence_int16 = (silence * 32767).astype(np.int16)
-            wf.writeframes(silence_int16.tobytes())
+        # 先为所有模型发起权重预读，与下面 mlx_audio 的导入重叠进行
+        for model_key in model_keys:
+            _prefetch_model_files(get_model_path(model_key))
 
-        # 进行一次假转录来预热
+        # 提前导入转录入口（首次导入需要数百毫秒），首个请求不再承担这部分耗时
         from mlx_audio.stt.generate import generate_transcription
-        _ = generate_transcription(
-            model=model,
-            audio=temp_path,
-            output_path=tempfile.NamedTemporaryFile(suffix='.txt', delete=False).name,
-            language='Chinese',
-            verbose=False
-        )
-
-        # 清理临时文件
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
+
+        # 用一段静音音频直接跑一次模型前向，触发 MLX 内核编译
+        # （不经过 generate_transcription，不写输出文件）
+        import mlx.core as mx
+        silence = mx.zeros(16000, dtype=mx.float32)  # 1秒静音
+
+        for model_key in model_keys:
+            model = load_model(model_key)
+            with _inference_lock:
+                if hasattr(model, 'generate'):
+                    _ = model.generate(silence, language='Chinese')
+                else:
+                    _ = generate_transcription(
+                        model=model,
+                        audio=silence,
+                        output_path=_OUTPUT_PATH,
+                        language='Chinese',
+                        verbose=False
+                    )
 
         print("[ASR Server] 模型预热完成")
     except Exception as e:
         print(f"[ASR Server] 预热失败（不影响使用）: {e}")
+    finally:
+        _warmup_done.set()
 
 def start_server():
     """启动 Unix Socket 服务端"""
@@ -777,8 +1109,13 @@ def start_server():
         os.unlink(socket_path)
 
     server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # 放大接收缓冲区（accept 出来的连接会继承），几 MB 的录音可以更少次数收完
+    try:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    except OSError as e:
+        print(f"[ASR Server] 设置接收缓冲区失败（不影响使用）: {e}")
     server.bind(socket_path)
-    server.listen(5)
+    server.listen(socket.SOMAXCONN)
 
     print(f"[ASR Server] 已启动，监听 {socket_path}")
     print(f"[ASR Server] 当前模型: {CONFIG['model']} ({CONFIG['models'][CONFIG['model']]})")
@@ -786,20 +1123,22 @@ def start_server():
     print(f"[ASR Server] 可用模型: {', '.join(CONFIG['models'].keys())}")
 
     # 后台线程预热模型
-    import threading
     threading.Thread(target=warmup_model, daemon=True).start()
 
+    # 请求交给线程池处理：接收/后处理与另一请求的推理可以重叠
+    pool = ThreadPoolExecutor(max_workers=2)
+
     try:
         while True:
             conn, addr = server.accept()
-            handle_client(conn)
+            pool.submit(handle_client, conn)
     except KeyboardInterrupt:
         print("\n[ASR Server] 关闭中...")
     finally:
+        pool.shutdown(wait=False)
         server.close()
         if os.path.exists(socket_path):
             os.unlink(socket_path)
 
 if __name__ == '__main__':
-    load_config()
     start_server()
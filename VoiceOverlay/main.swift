@@ -17,6 +17,49 @@ extension UInt16 {
     }
 }
 
+// MARK: - WAV 封装 (录音与 ping 共用)
+func createWAVData(pcmData: Data, sampleRate: UInt32, channels: UInt16, bitsPerSample: UInt16) -> Data {
+    let byteRate = sampleRate * UInt32(channels) * UInt32(bitsPerSample) / 8
+    let blockAlign = channels * bitsPerSample / 8
+    let dataSize = UInt32(pcmData.count)
+    let fileSize = 36 + dataSize
+
+    // 一次分配好 44 字节头部 + PCM 数据的空间，避免逐段追加时扩容拷贝
+    var wavData = Data(capacity: 44 + pcmData.count)
+
+    // RIFF chunk
+    wavData.append(contentsOf: "RIFF".utf8)
+    wavData.append(fileSize.littleEndianBytes)
+    wavData.append(contentsOf: "WAVE".utf8)
+
+    // fmt subchunk
+    wavData.append(contentsOf: "fmt ".utf8)
+    wavData.append(UInt32(16).littleEndianBytes)
+    wavData.append(UInt16(1).littleEndianBytes)
+    wavData.append(channels.littleEndianBytes)
+    wavData.append(sampleRate.littleEndianBytes)
+    wavData.append(byteRate.littleEndianBytes)
+    wavData.append(blockAlign.littleEndianBytes)
+    wavData.append(bitsPerSample.littleEndianBytes)
+
+    // data subchunk
+    wavData.append(contentsOf: "data".utf8)
+    wavData.append(dataSize.littleEndianBytes)
+    wavData.append(pcmData)
+
+    return wavData
+}
+
+// MARK: - 调试日志
+// 设置环境变量 ASR_DEBUG=1 时输出详细日志；关闭时不做字符串插值
+let isDebugLogging = ProcessInfo.processInfo.environment["ASR_DEBUG"] != nil
+
+func debugLog(_ message: @autoclosure () -> String) {
+    if isDebugLogging {
+        print(message())
+    }
+}
+
 // MARK: - 全局快捷键管理器
 class GlobalHotkeyManager {
     static let shared = GlobalHotkeyManager()
@@ -79,29 +122,30 @@ class GlobalHotkeyManager {
     }
 
     static func handleEvent(proxy: CGEventTapProxy, type: CGEventType, event: CGEvent, refcon: UnsafeMutableRawPointer?) -> Unmanaged<CGEvent>? {
-        let manager = Unmanaged<GlobalHotkeyManager>.fromOpaque(refcon!).takeUnretainedValue()
-
         if type == .flagsChanged {
-            let flags = event.flags
             let keycode = event.getIntegerValueField(.keyboardEventKeycode)
 
             struct Static {
-                static var lastTrigger: TimeInterval = 0
+                static var lastTrigger: TimeInterval = 0  // 开机以来的秒数（单调递增，不受系统时间调整影响）
                 static var wasRightCommandPressed = false
             }
 
-            // 只处理右 Command (keycode 54)
+            // 只处理右 Command (keycode 54)，其他修饰键直接放行，不做多余工作
             guard keycode == 54 else {
                 return Unmanaged.passUnretained(event)
             }
 
-            let isCommandPressed = flags.contains(.maskCommand)
+            let manager = Unmanaged<GlobalHotkeyManager>.fromOpaque(refcon!).takeUnretainedValue()
+            let isCommandPressed = event.flags.contains(.maskCommand)
 
             if isCommandPressed && !Static.wasRightCommandPressed {
                 Static.wasRightCommandPressed = true
             } else if !isCommandPressed && Static.wasRightCommandPressed {
                 Static.wasRightCommandPressed = false
-                let now = Date().timeIntervalSince1970
+                // 用单调时钟计时，不受系统时间调整影响；
+                // 不用 event.timestamp：它在 Apple Silicon 上是 mach 时钟 tick 而非纳秒，
+                // 且合成事件的时间戳可能更早，无符号相减会溢出崩溃
+                let now = ProcessInfo.processInfo.systemUptime
                 // 增加防抖动时间到 1 秒
                 if now - Static.lastTrigger > 1.0 {
                     Static.lastTrigger = now
@@ -227,16 +271,33 @@ class WaveView: NSView {
         NSColor(red: 0.3, green: 0.55, blue: 1.0, alpha: 1.0),  // 紫蓝
         NSColor(red: 0.1, green: 0.65, blue: 1.0, alpha: 1.0)   // 蓝色
     ]
+    // 发光描边色，避免每帧重新创建
+    private lazy var glowColors = gradientColors.map { $0.withAlphaComponent(0.3) }
+
+    private static let barWidth: CGFloat = 3
+    private static let barGap: CGFloat = 4
+    private static let maxBarHeight: CGFloat = 26
+    private static let minBarHeight: CGFloat = 3
+
+    // 条形所在区域（含发光描边），动画只需重绘这一块
+    private var barsRect: NSRect {
+        let totalWidth = CGFloat(bars.count) * WaveView.barWidth + CGFloat(bars.count - 1) * WaveView.barGap
+        let rect = NSRect(x: (bounds.width - totalWidth) / 2,
+                          y: (bounds.height - WaveView.maxBarHeight) / 2,
+                          width: totalWidth,
+                          height: WaveView.maxBarHeight)
+        return rect.insetBy(dx: -1, dy: -1).integral
+    }
 
     override func draw(_ dirtyRect: NSRect) {
         super.draw(dirtyRect)
 
-        let barWidth: CGFloat = 3
-        let barGap: CGFloat = 4
+        let barWidth = WaveView.barWidth
+        let barGap = WaveView.barGap
         let totalWidth = CGFloat(bars.count) * barWidth + CGFloat(bars.count - 1) * barGap
         let startX = (bounds.width - totalWidth) / 2
-        let maxBarHeight: CGFloat = 26
-        let minBarHeight: CGFloat = 3
+        let maxBarHeight = WaveView.maxBarHeight
+        let minBarHeight = WaveView.minBarHeight
         let centerY = bounds.height / 2
 
         for (i, amplitude) in bars.enumerated() {
@@ -248,13 +309,12 @@ class WaveView: NSView {
             let path = NSBezierPath(roundedRect: rect, xRadius: 1.5, yRadius: 1.5)
 
             // 使用渐变色
-            let color = gradientColors[i % gradientColors.count]
-            color.setFill()
+            gradientColors[i % gradientColors.count].setFill()
             path.fill()
 
             // 添加微妙的发光效果
             let glowPath = NSBezierPath(roundedRect: rect.insetBy(dx: -0.5, dy: -0.5), xRadius: 2, yRadius: 2)
-            color.withAlphaComponent(0.3).setStroke()
+            glowColors[i % glowColors.count].setStroke()
             glowPath.lineWidth = 0.5
             glowPath.stroke()
         }
@@ -275,7 +335,7 @@ class WaveView: NSView {
         animationTimer = nil
         // 重置为平静状态
         bars = Array(repeating: 0.3, count: 5)
-        needsDisplay = true
+        setNeedsDisplay(barsRect)
     }
 
     private func updateAnimation() {
@@ -296,7 +356,7 @@ class WaveView: NSView {
             bars[i] += diff * 0.3 // 平滑系数
         }
 
-        needsDisplay = true
+        setNeedsDisplay(barsRect)
     }
 }
 
@@ -365,37 +425,6 @@ class AudioRecorder: NSObject {
             return nil
         }
     }
-
-    private func createWAVData(pcmData: Data, sampleRate: UInt32, channels: UInt16, bitsPerSample: UInt16) -> Data {
-        let byteRate = sampleRate * UInt32(channels) * UInt32(bitsPerSample) / 8
-        let blockAlign = channels * bitsPerSample / 8
-        let dataSize = UInt32(pcmData.count)
-        let fileSize = 36 + dataSize
-
-        var wavData = Data()
-
-        // RIFF chunk
-        wavData.append("RIFF".data(using: .ascii)!)
-        wavData.append(fileSize.littleEndianBytes)
-        wavData.append("WAVE".data(using: .ascii)!)
-
-        // fmt subchunk
-        wavData.append("fmt ".data(using: .ascii)!)
-        wavData.append(UInt32(16).littleEndianBytes)
-        wavData.append(UInt16(1).littleEndianBytes)
-        wavData.append(channels.littleEndianBytes)
-        wavData.append(sampleRate.littleEndianBytes)
-        wavData.append(byteRate.littleEndianBytes)
-        wavData.append(blockAlign.littleEndianBytes)
-        wavData.append(bitsPerSample.littleEndianBytes)
-
-        // data subchunk
-        wavData.append("data".data(using: .ascii)!)
-        wavData.append(dataSize.littleEndianBytes)
-        wavData.append(pcmData)
-
-        return wavData
-    }
 }
 
 // MARK: - ASR 客户端
@@ -406,34 +435,34 @@ class ASRClient {
     func transcribe(audioData: Data, completion: @escaping (String?) -> Void) {
         DispatchQueue.global(qos: .userInitiated).async {
             do {
-                print("[ASR] 创建 socket...")
+                debugLog("[ASR] 创建 socket...")
                 let socket = try self.createSocket()
                 defer { socket.close() }
-                print("[ASR] Socket 连接成功")
+                debugLog("[ASR] Socket 连接成功")
 
                 // 发送音频数据长度
                 var length = UInt32(audioData.count).bigEndian
                 let sentLen = withUnsafeBytes(of: &length) { socket.write(Data($0)) }
-                print("[ASR] 发送长度: \(sentLen) bytes")
+                debugLog("[ASR] 发送长度: \(sentLen) bytes")
 
                 // 发送音频数据
                 let sentData = socket.write(audioData)
-                print("[ASR] 发送数据: \(sentData) bytes")
+                debugLog("[ASR] 发送数据: \(sentData) bytes")
 
                 // 接收结果长度
                 var resultLengthBuffer = Data(repeating: 0, count: 4)
                 let readLen = socket.read(into: &resultLengthBuffer)
-                print("[ASR] 读取长度: \(readLen) bytes")
+                debugLog("[ASR] 读取长度: \(readLen) bytes")
                 let resultLength = resultLengthBuffer.withUnsafeBytes { $0.load(as: UInt32.self).bigEndian }
-                print("[ASR] 结果长度: \(resultLength)")
+                debugLog("[ASR] 结果长度: \(resultLength)")
 
                 // 接收结果
                 var resultBuffer = Data(repeating: 0, count: Int(resultLength))
                 let readResult = socket.read(into: &resultBuffer)
-                print("[ASR] 读取结果: \(readResult) bytes")
+                debugLog("[ASR] 读取结果: \(readResult) bytes")
 
                 if let json = try? JSONSerialization.jsonObject(with: resultBuffer) as? [String: Any] {
-                    print("[ASR] JSON: \(json)")
+                    debugLog("[ASR] JSON: \(json)")
                     if let success = json["success"] as? Bool, success {
                         let text = json["text"] as? String
                         print("[ASR] 识别成功: \"\(text ?? "nil")\"")
@@ -503,37 +532,6 @@ class ASRClient {
         }
     }
 
-    private func createWAVData(pcmData: Data, sampleRate: UInt32, channels: UInt16, bitsPerSample: UInt16) -> Data {
-        let byteRate = sampleRate * UInt32(channels) * UInt32(bitsPerSample) / 8
-        let blockAlign = channels * bitsPerSample / 8
-        let dataSize = UInt32(pcmData.count)
-        let fileSize = 36 + dataSize
-
-        var wavData = Data()
-
-        // RIFF chunk
-        wavData.append("RIFF".data(using: .ascii)!)
-        wavData.append(fileSize.littleEndianBytes)
-        wavData.append("WAVE".data(using: .ascii)!)
-
-        // fmt subchunk
-        wavData.append("fmt ".data(using: .ascii)!)
-        wavData.append(UInt32(16).littleEndianBytes)
-        wavData.append(UInt16(1).littleEndianBytes)
-        wavData.append(channels.littleEndianBytes)
-        wavData.append(sampleRate.littleEndianBytes)
-        wavData.append(byteRate.littleEndianBytes)
-        wavData.append(blockAlign.littleEndianBytes)
-        wavData.append(bitsPerSample.littleEndianBytes)
-
-        // data subchunk
-        wavData.append("data".data(using: .ascii)!)
-        wavData.append(dataSize.littleEndianBytes)
-        wavData.append(pcmData)
-
-        return wavData
-    }
-
     private func createSocket() throws -> Socket {
         let socket = try Socket.create(family: .unix, type: .stream, protocol: .unix)
         try socket.connect(to: socketPath)
@@ -777,15 +775,15 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         freopen(logPath.cString(using: .utf8), "w", stderr)
         setbuf(stdout, nil)
 
-        print("[DEBUG] 应用启动")
+        debugLog("[DEBUG] 应用启动")
 
         // 单实例检查
         if !SingleInstanceLock.shared.acquire() {
-            print("[DEBUG] 单实例检查失败，退出")
+            debugLog("[DEBUG] 单实例检查失败，退出")
             NSApplication.shared.terminate(nil)
             return
         }
-        print("[DEBUG] 单实例检查通过")
+        debugLog("[DEBUG] 单实例检查通过")
 
         // 显示启动画面
         showSplashScreen()
@@ -801,14 +799,14 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         // 启动画面固定在内置主屏幕
         let targetScreen = NSScreen.screens.first { $0.frame.origin == .zero } ?? NSScreen.main
         let screenFrame = targetScreen?.frame ?? NSRect(x: 0, y: 0, width: 1920, height: 1080)
-        print("[DEBUG] 选中屏幕 frame: \(screenFrame), 所有屏幕: \(NSScreen.screens.map { $0.frame })")
+        debugLog("[DEBUG] 选中屏幕 frame: \(screenFrame), 所有屏幕: \(NSScreen.screens.map { $0.frame })")
 
         let splashWidth: CGFloat = 280
         let splashHeight: CGFloat = 200
         // 考虑多显示器环境，需要加上屏幕原点的偏移
         let x = screenFrame.origin.x + (screenFrame.width - splashWidth) / 2
         let y = screenFrame.origin.y + (screenFrame.height - splashHeight) / 2
-        print("[DEBUG] 启动画面位置: x=\(x), y=\(y)")
+        debugLog("[DEBUG] 启动画面位置: x=\(x), y=\(y)")
 
         splashWindow = SplashWindow(
             contentRect: NSRect(x: x, y: y, width: splashWidth, height: splashHeight),
@@ -818,7 +816,7 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         )
 
         splashWindow.makeKeyAndOrderFront(nil)
-        print("[DEBUG] 启动画面已显示")
+        debugLog("[DEBUG] 启动画面已显示")
 
         // 2秒后淡出并初始化主应用
         DispatchQueue.main.asyncAfter(deadline: .now() + 2.0) { [weak self] in
@@ -1139,7 +1137,7 @@ class AppDelegate: NSObject, NSApplicationDelegate {
         }
 
         // 发送到 ASR 服务端
-        print("[ASR] 发送音频数据: \(audioData.count) bytes")
+        debugLog("[ASR] 发送音频数据: \(audioData.count) bytes")
         ASRClient.shared.transcribe(audioData: audioData) { text in
             if let text = text, !text.isEmpty {
                 print("✓ 识别结果: \(text)")
@@ -1239,21 +1237,26 @@ class AppDelegate: NSObject, NSApplicationDelegate {
             return "未知"
         }
 
-        // 查找最新加载的模型
+        // 优先取最近一次启动打印的主模型（当前模型:）；
+        // 配置了 short_model 时服务端还会加载短录音模型，"加载模型 [" 行不一定是主模型
         let lines = content.components(separatedBy: .newlines)
         for line in lines.reversed() {
-            if line.contains("加载模型 [") {
-                if line.contains("1.7B") {
+            if let range = line.range(of: "当前模型:") {
+                let modelInfo = String(line[range.upperBound...])
+                if modelInfo.contains("1.7B") {
                     return "1.7B"
-                } else if line.contains("0.6B") {
+                } else if modelInfo.contains("0.6B") {
                     return "0.6B"
                 }
             }
-            if line.contains("当前模型:"), let range = line.range(of: "当前模型:") {
-                let modelInfo = String(line[range.upperBound...])
-                if modelInfo.contains("1.7B") {
+        }
+
+        // 兼容旧日志：没有启动信息时退回最新加载的模型
+        for line in lines.reversed() {
+            if line.contains("加载模型 [") {
+                if line.contains("1.7B") {
                     return "1.7B"
-                } else if modelInfo.contains("0.6B") {
+                } else if line.contains("0.6B") {
                     return "0.6B"
                 }
             }
@@ -50,7 +50,7 @@ source venv/bin/activate
 echo ""
 echo "📦 安装依赖..."
 pip install -q --upgrade pip
-pip install -q mlx-audio pyyaml
+pip install -q mlx-audio pyyaml pyahocorasick
 
 echo "✅ 依赖安装完成"
 
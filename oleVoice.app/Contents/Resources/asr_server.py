@@ -0,0 +1 @@
+../../../VoiceOverlay/asr_server.py
\ No newline at end of file
@@ -5,6 +5,7 @@
     python switch_model.py          # 查看当前模型和可用选项
     python switch_model.py 0.6B     # 切换到小模型
     python switch_model.py 1.7B     # 切换到大模型
+    python switch_model.py 1.7B-4bit  # 切换到 4bit 量化大模型
 """
 
 import sys
@@ -50,7 +51,9 @@ def show_status(config):
     print("\n📦 可用模型:")
     for key, path in models.items():
         marker = " ✅" if key == current_model else ""
-        desc = "快速，内存占用小" if key == "0.6B" else "高精度，质量更好"
+        desc = "快速，内存占用小" if key.startswith("0.6B") else "高精度，质量更好"
+        if key.endswith("4bit"):
+            desc += "（4bit 量化，更快）"
         print(f"   {key}: {desc}{marker}")
 
     print("\n💡 使用方法:")